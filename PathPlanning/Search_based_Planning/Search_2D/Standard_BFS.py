@@ -12,14 +12,13 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)) +
                 "/../../Search_based_Planning/")
 
 from Search_2D import plotting, env
-from Search_2D.Astar import AStar
+from Search_2D.Real_Astar import AStar
 import math
-import heapq
 
 class BFS(AStar):
     """
     BFS 广度优先搜索类
-    继承自 AStar 类，通过修改节点优先级实现 BFS
+    继承自 AStar 类，OPEN 使用 deque 实现 FIFO 队列
     BFS 将新访问的节点添加到 openset 的末尾，确保按层级顺序搜索
     标准 BFS：只允许上下左右4个方向移动
     """
@@ -34,6 +33,8 @@ class BFS(AStar):
         # 重写移动方向：只允许上下左右4个方向
         # (x, y): 上(0,1), 下(0,-1), 左(-1,0), 右(1,0)
         self.u_set = [(0, 1), (0, -1), (-1, 0), (1, 0)]
+        # OPEN 为 FIFO 队列：append 入队，popleft 出队，均为 O(1)
+        self.OPEN = deque()
     
     def cost(self, s_start, s_goal):
         """
@@ -43,8 +44,9 @@ class BFS(AStar):
         :param s_goal: 目标节点
         :return: 移动代价（恒为1）
         """
-        # 检查碰撞
-        if self.is_collision(s_start, s_goal):
+        # 检查碰撞：只有上下左右移动，碰撞即任一端点为障碍物，直接查可通行掩码
+        free = self.free
+        if not (free[s_start] and free[s_goal]):
             return math.inf
         
         # BFS 核心：所有移动代价都是 1（只允许上下左右移动）
@@ -56,55 +58,72 @@ class BFS(AStar):
         :return: path (路径列表), visited (访问顺序列表)
         """
 
-        # 初始化起点：父节点指向自己
-        self.PARENT[self.s_start] = self.s_start
+        W = self.W
+        g_arr = self.g_arr
+        parent_arr = self.parent_arr
+
+        # 热循环中反复使用的属性与方法绑定为局部变量
+        OPEN = self.OPEN
+        CLOSED = self.CLOSED
+        visited_order = self.visited_order
+        push, pop = OPEN.append, OPEN.popleft
+        # 每个格子的合法移动由位掩码查表得到（越界与障碍物已被屏蔽）
+        moves = self.get_moves()
+        moves_by_mask = self.get_moves_by_mask(moves)
+        move_masks = self.get_move_masks(moves)
+        s_goal = self.s_goal
+
+        # 初始化起点：父节点指向自己（数组已初始化为 inf / -1）
+        start_idx = self._pack(self.s_start)
+        parent_arr[start_idx] = start_idx
         # 起点的代价为 0
-        self.g[self.s_start] = 0
-        # 终点的初始代价设为无穷大
-        self.g[self.s_goal] = math.inf
-        # 将起点加入 OPEN 列表（优先级为 0）
-        heapq.heappush(self.OPEN,
-                       (0, self.s_start))
+        g_arr[start_idx] = 0
+        # 将起点加入 OPEN 队列
+        push(self.s_start)
 
         # 主循环：当 OPEN 列表不为空时继续搜索
-        while self.OPEN:
-            # 从 OPEN 列表中弹出优先级最小的节点（FIFO 队列行为）
-            _, s = heapq.heappop(self.OPEN)
+        while OPEN:
+            # 从 OPEN 队列头部弹出节点（FIFO 队列行为）
+            s = pop()
             # 将当前节点加入 CLOSED 列表（已访问）
-            self.CLOSED.append(s)
+            CLOSED.add(s)
+            visited_order.append(s)
 
             # 如果到达目标点，停止搜索
-            if s == self.s_goal:
+            if s == s_goal:
                 break
 
-            # 遍历当前节点的所有邻居节点
-            for s_n in self.get_neighbor(s):
-                # 计算从起点经过当前节点到邻居节点的代价
-                new_cost = self.g[s] + self.cost(s, s_n)
+            x, y = s
+            s_idx = y * W + x
+            g_s = g_arr[s_idx]
 
-                # 如果邻居节点未被访问过，初始化其代价为无穷大
-                if s_n not in self.g:
-                    self.g[s_n] = math.inf
+            # 遍历当前节点的所有合法邻居（只有上下左右4个方向）
+            for dx, dy, _, d_idx in moves_by_mask[move_masks[s_idx]]:
+                n_idx = s_idx + d_idx
 
-                # 如果找到更优路径，更新节点信息
-                if new_cost < self.g[s_n]:
-                    # 更新邻居节点的代价
-                    self.g[s_n] = new_cost
-                    # 记录邻居节点的父节点
-                    self.PARENT[s_n] = s
+                # 每个节点只在第一次被发现时入队：所有边代价都为 1，
+                # 按层扩展时首次发现的距离就是最短距离，无需再松弛
+                if g_arr[n_idx] != math.inf:
+                    continue
 
-                    # BFS 核心：将新节点添加到 openset 的末尾
-                    # 通过递增优先级值确保 FIFO（先进先出）队列行为
-                    prior = self.OPEN[-1][0]+1 if len(self.OPEN)>0 else 0
-                    heapq.heappush(self.OPEN, (prior, s_n))
+                # 更新邻居节点的代价（与 cost 一致：无碰撞的移动代价恒为 1）
+                g_arr[n_idx] = g_s + 1
+                # 记录邻居节点的父节点
+                parent_arr[n_idx] = s_idx
+
+                # BFS 核心：将新节点添加到 openset 的末尾（FIFO）
+                push((x + dx, y + dy))
+
+        self.export_g()
 
         # 返回路径和访问顺序
-        return self.extract_path(self.PARENT), self.CLOSED
+        return self.extract_path_arr(parent_arr), visited_order
 
 
-def main():
+def main(animate=True):
     """
     主函数：演示 BFS 算法的使用
+    :param animate: 是否播放搜索动画（命令行传入 --no-anim 时关闭）
     """
     # 定义起点坐标
     s_start = (5, 5)
@@ -121,8 +140,9 @@ def main():
     path, visited = bfs.searching()
     # 动画展示搜索过程和最终路径
     # 传递 bfs.g 代价字典，用于显示每个节点的距离标注
-    plot.animation(path, visited, "Breadth-first Searching (BFS)", cost_dict=bfs.g)
+    plot.animation(path, visited, "Breadth-first Searching (BFS)", cost_dict=bfs.g,
+                   animate=animate)
 
 
 if __name__ == '__main__':
-    main()
+    main(animate='--no-anim' not in sys.argv)
@@ -13,7 +13,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)) +
                 "/../../Search_based_Planning/")
 
 from Search_2D import plotting, env
-from Search_2D.Astar import AStar
+from Search_2D.Real_Astar import AStar
 
 class DFS(AStar):
     """
@@ -45,8 +45,9 @@ class DFS(AStar):
         :param s_goal: 目标节点
         :return: 移动代价（恒为1）
         """
-        # 检查碰撞
-        if self.is_collision(s_start, s_goal):
+        # 检查碰撞：只有上下左右移动，碰撞即任一端点为障碍物，直接查可通行掩码
+        free = self.free
+        if not (free[s_start] and free[s_goal]):
             return math.inf
         
         # DFS 核心：所有移动代价都是 1（只允许上下左右移动）
@@ -60,16 +61,30 @@ class DFS(AStar):
         :return: path (路径列表), visited (访问顺序列表)
         """
 
+        W = self.W
+        g_arr = self.g_arr
+        parent_arr = self.parent_arr
+
+        # 热循环中反复使用的属性与方法绑定为局部变量
+        CLOSED = self.CLOSED
+        visited_order = self.visited_order
+        # 每个格子的合法移动由位掩码查表得到（越界与障碍物已被屏蔽）
+        moves = self.get_moves()
+        moves_by_mask = self.get_moves_by_mask(moves)
+        move_masks = self.get_move_masks(moves)
+        s_goal = self.s_goal
+
         # 初始化
-        self.PARENT[self.s_start] = self.s_start
-        self.g[self.s_start] = 0  # 用于显示距离标注
+        start_idx = self._pack(self.s_start)
+        parent_arr[start_idx] = start_idx
+        g_arr[start_idx] = 0  # 用于显示距离标注
         
         # 栈结构（使用列表模拟）
         stack = [self.s_start]
         
-        # 已访问节点集合（纯DFS的核心）
-        visited = set()
-        visited.add(self.s_start)
+        # 已访问标记（纯DFS的核心）：按线性下标 y * W + x 存储的字节数组
+        visited = bytearray(W * self.H)
+        visited[start_idx] = 1
         
         step = 0  # 步数计数
 
@@ -99,27 +114,34 @@ class DFS(AStar):
                 print(f"  ★ POP出栈: {s}")
             
             # 记录访问顺序
-            self.CLOSED.append(s)
+            CLOSED.add(s)
+            visited_order.append(s)
 
             # 如果到达目标点，停止搜索
-            if s == self.s_goal:
+            if s == s_goal:
                 if debug_steps > 0 and step <= debug_steps:
                     print(f"  🎯 找到目标！")
                 break
 
             # 遍历当前节点的所有邻居节点
+            x, y = s
+            s_idx = y * W + x
+            g_s = g_arr[s_idx]
             pushed = []  # 记录本次压入栈的节点
-            for s_n in self.get_neighbor(s):
+            # 只遍历合法邻居（上下左右4个方向中不碰撞的方向，顺序与 u_set 一致）
+            for dx, dy, _, d_idx in moves_by_mask[move_masks[s_idx]]:
+                n_idx = s_idx + d_idx
+                s_n = (x + dx, y + dy)
                 # 纯DFS逻辑：只检查是否访问过，不考虑代价
-                if s_n not in visited and not self.is_collision(s, s_n):
+                if not visited[n_idx]:
                     # 标记为已访问（关键：在加入栈时就标记，避免重复加入）
-                    visited.add(s_n)
-                    
+                    visited[n_idx] = 1
+
                     # 记录父节点（用于回溯路径）
-                    self.PARENT[s_n] = s
+                    parent_arr[n_idx] = s_idx
                     
                     # 记录距离（仅用于可视化显示数字）
-                    self.g[s_n] = self.g[s] + 1
+                    g_arr[n_idx] = g_s + 1
                     
                     # 压入栈顶（LIFO）
                     stack.append(s_n)
@@ -137,13 +159,16 @@ class DFS(AStar):
                 print(f"已显示前 {debug_steps} 步，继续搜索中...")
                 print("=" * 80 + "\n")
 
+        self.export_g()
+
         # 返回路径和访问顺序
-        return self.extract_path(self.PARENT), self.CLOSED
+        return self.extract_path_arr(parent_arr), visited_order
 
 
-def main():
+def main(animate=True):
     """
     主函数：演示 DFS 算法的使用
+    :param animate: 是否播放搜索动画（命令行传入 --no-anim 时关闭）
     """
     # 定义起点坐标
     s_start = (5, 5)
@@ -165,8 +190,9 @@ def main():
     visited = list(dict.fromkeys(visited))
     # 动画展示搜索过程和最终路径
     # 传递 dfs.g 代价字典，用于显示每个节点的距离标注
-    plot.animation(path, visited, "Depth-first Searching (DFS)", cost_dict=dfs.g)
+    plot.animation(path, visited, "Depth-first Searching (DFS)", cost_dict=dfs.g,
+                   animate=animate)
 
 
 if __name__ == '__main__':
-    main()
+    main(animate='--no-anim' not in sys.argv)
@@ -7,6 +7,8 @@ Plot tools 2D
 
 import os
 import sys
+import time
+import numpy as np
 import matplotlib.pyplot as plt
 
 # 将搜索模块路径添加到系统路径
@@ -31,6 +33,8 @@ class Plotting:
         self.env = env.Env()
         # 获取障碍物地图
         self.obs = self.env.obs_map()
+        # 障碍物坐标数组（N x 2），绘图时直接使用
+        self._obs_xy = self._to_xy(self.obs)
 
     def update_obs(self, obs):
         """
@@ -38,8 +42,19 @@ class Plotting:
         :param obs: 新的障碍物列表
         """
         self.obs = obs
+        self._obs_xy = self._to_xy(obs)
 
-    def animation(self, path, visited, name, cost_dict=None, terrain_colors=None):
+    @staticmethod
+    def _to_xy(nodes):
+        """
+        节点集合 -> (N, 2) 整数坐标数组
+        :param nodes: 节点集合 {(x, y), ...}
+        :return: 坐标数组
+        """
+        return np.array(list(nodes), dtype=np.int32).reshape(-1, 2)
+
+    def animation(self, path, visited, name, cost_dict=None, terrain_colors=None,
+                  animate=True):
         """
         标准动画函数：展示搜索过程和最终路径
         适用于大多数搜索算法（BFS, DFS, A*, Dijkstra等）
@@ -48,15 +63,17 @@ class Plotting:
         :param name: 算法名称（显示在标题）
         :param cost_dict: 可选，节点代价字典，用于显示距离标注
         :param terrain_colors: 可选，地形颜色字典 {节点: 颜色}
+        :param animate: 是否逐帧播放动画；False 时一次性绘制结果，不暂停
         """
         self.plot_grid(name)                    # 绘制网格和障碍物
+        self.connect_escape()                   # 按 Esc 退出
         
         # 先绘制地形节点（作为背景）
         if terrain_colors:
             self.plot_terrain(terrain_colors)
         
-        self.plot_visited(visited, cost_dict=cost_dict)  # 绘制访问过程（动画）
-        self.plot_path(path)                    # 绘制最终路径
+        self.plot_visited(visited, cost_dict=cost_dict, animate=animate)  # 绘制访问过程（动画）
+        self.plot_path(path, animate=animate)   # 绘制最终路径
         plt.show()                              # 显示图形窗口
 
     def animation_lrta(self, path, visited, name):
@@ -68,6 +85,7 @@ class Plotting:
         :param name: 算法名称
         """
         self.plot_grid(name)
+        self.connect_escape()
         cl = self.color_list_2()  # 获取颜色列表，用于区分不同迭代
         path_combine = []  # 合并所有路径
 
@@ -93,6 +111,7 @@ class Plotting:
         :param name: 算法名称
         """
         self.plot_grid(name)
+        self.connect_escape()
         cl_v, cl_p = self.color_list()  # 获取访问节点和路径的颜色列表
 
         # 逐次显示每次优化的过程
@@ -113,25 +132,38 @@ class Plotting:
         :param name: 算法名称
         """
         self.plot_grid(name)
+        self.connect_escape()
         self.plot_visited_bi(v_fore, v_back)  # 绘制双向搜索过程
         self.plot_path(path)                  # 绘制最终路径
         plt.show()
 
+    def connect_escape(self):
+        """
+        为当前图形注册一次按键回调（按 Esc 退出程序）
+        每次动画只注册一次，避免在逐节点绘制时重复注册大量回调
+        """
+        plt.gcf().canvas.mpl_connect('key_release_event', self.on_key)
+
+    @staticmethod
+    def on_key(event):
+        """
+        按键回调：按 Esc 键退出程序
+        :param event: matplotlib 按键事件
+        """
+        if event.key == 'escape':
+            exit(0)
+
     def plot_grid(self, name):
         """
         绘制网格、起点、终点和障碍物
         :param name: 图形标题（通常是算法名称）
         """
-        # 提取障碍物的 x 和 y 坐标
-        obs_x = [x[0] for x in self.obs]
-        obs_y = [x[1] for x in self.obs]
-
         # 绘制起点（蓝色方块）
         plt.plot(self.xI[0], self.xI[1], "bs", markersize=8)
         # 绘制终点（绿色方块）
         plt.plot(self.xG[0], self.xG[1], "gs", markersize=8)
-        # 绘制障碍物（黑色方块）
-        plt.plot(obs_x, obs_y, "sk")
+        # 绘制障碍物（黑色方块），坐标数组已在初始化 / update_obs 时缓存
+        plt.plot(self._obs_xy[:, 0], self._obs_xy[:, 1], "sk")
         # 设置图形标题
         plt.title(name)
         # 设置坐标轴比例相等（确保网格是正方形）
@@ -147,12 +179,13 @@ class Plotting:
             plt.plot(node[0], node[1], marker='o', color=color, 
                     markersize=15, alpha=0.6)
 
-    def plot_visited(self, visited, cl='gray', cost_dict=None):
+    def plot_visited(self, visited, cl='gray', cost_dict=None, animate=True):
         """
         绘制已访问的节点（动画显示搜索过程）
         :param visited: 已访问节点列表
         :param cl: 节点颜色
         :param cost_dict: 可选，节点代价字典 {节点: 代价值}，用于显示距离标注
+        :param animate: 是否逐帧播放动画；False 时一次性绘制全部节点，不暂停
         """
         if self.xI in visited:
             visited.remove(self.xI)
@@ -160,39 +193,41 @@ class Plotting:
         if self.xG in visited:
             visited.remove(self.xG)
 
-        count = 0
-
-        for x in visited:
-            count += 1
-            plt.plot(x[0], x[1], color=cl, marker='o', markersize=10)
-            
-            # ========== 距离标注显示 ==========
-            # 如果提供了代价字典，在节点圆圈中心显示距离数字
-            if cost_dict is not None and x in cost_dict:
-                # 显示距离数字（整数显示，避免圆圈太小放不下）
-                distance = cost_dict[x]
-                plt.text(x[0], x[1], f'{int(distance)}', 
-                        fontsize=7, color='white', weight='bold',
-                        ha='center', va='center')
-            
-            plt.gcf().canvas.mpl_connect('key_release_event',
-                                         lambda event: [exit(0) if event.key == 'escape' else None])
-
-            # ========== 动画速度控制参数 ==========
-            # 原始设置：根据进度调整刷新频率（注释掉）
-            # if count < len(visited) / 3:
-            #     length = 20
-            # elif count < len(visited) * 2 / 3:
-            #     length = 30
-            # else:
-            #     length = 40
-            
-            # 更详细的显示：每个节点都暂停（可调整）
-            # 调整建议：
-            #   - length = 1  : 每个节点都显示（最详细，但慢）
-            #   - length = 5  : 每5个节点刷新一次（较详细）
-            #   - length = 10 : 每10个节点刷新一次（适中）
-            length = 10  
+        # 所有已访问节点共用一个散点集合，动画时只更新其坐标，
+        # 不再为每个节点单独创建一条 Line2D（s = markersize ** 2，zorder 与 plt.plot 相同）
+        xy = np.array(visited, dtype=float).reshape(-1, 2)
+        sc = plt.gca().scatter([], [], color=cl, marker='o', s=100, zorder=2)
+
+        if not animate:
+            sc.set_offsets(xy)
+            self.plot_labels(visited, cost_dict)
+            return
+
+        # ========== 动画速度控制参数 ==========
+        # 原始设置：根据进度调整刷新频率（注释掉）
+        # if count < len(visited) / 3:
+        #     length = 20
+        # elif count < len(visited) * 2 / 3:
+        #     length = 30
+        # else:
+        #     length = 40
+
+        # 更详细的显示：每批节点刷新一次（可调整）
+        # 调整建议：
+        #   - length = 1  : 每个节点都显示（最详细，但慢）
+        #   - length = 5  : 每5个节点刷新一次（较详细）
+        #   - length = 10 : 每10个节点刷新一次（适中）
+        length = 10
+
+        # 逐帧刷新只重绘画布并处理界面事件，不再每帧调用 plt.pause
+        # （plt.pause 每次都要启动、停止一轮 GUI 事件循环）；窗口只需显示一次
+        fig = plt.gcf()
+        plt.show(block=False)
+
+        for start in range(0, len(visited), length):
+            count = min(start + length, len(visited))
+
+            sc.set_offsets(xy[:count])
 
             if count % length == 0:
                 # 暂停时间调整建议：
@@ -200,15 +235,51 @@ class Plotting:
                 #   - 0.05秒: 适中速度（当前设置）
                 #   - 0.1秒:  较慢，每步都很清晰
                 #   - 0.2秒:  很慢，适合演示讲解
-                plt.pause(0.05)
-        plt.pause(0.1)  # 所有节点绘制完成后的暂停时间
+                self._refresh(fig, 0.05)
 
-    def plot_path(self, path, cl='r', flag=False):
+        # 距离标注在全部节点绘制完成后一次性添加：
+        # 动画过程中每帧只重绘散点，不再重绘越来越多的文字
+        self.plot_labels(visited, cost_dict)
+        self._refresh(fig, 0.1)  # 所有节点绘制完成后的暂停时间
+
+    @staticmethod
+    def plot_labels(nodes, cost_dict):
+        """
+        在节点圆圈中心显示距离数字
+        :param nodes: 节点列表
+        :param cost_dict: 节点代价字典 {节点: 代价值}，为 None 时不显示
+        """
+        # ========== 距离标注显示 ==========
+        if cost_dict is None:
+            return
+
+        for x in nodes:
+            if x in cost_dict:
+                # 显示距离数字（整数显示，避免圆圈太小放不下）
+                distance = cost_dict[x]
+                plt.text(x[0], x[1], f'{int(distance)}',
+                        fontsize=7, color='white', weight='bold',
+                        ha='center', va='center')
+
+    @staticmethod
+    def _refresh(fig, t):
+        """
+        刷新一帧动画：请求重绘并处理待处理的界面事件，再暂停 t 秒
+        :param fig: 要刷新的图形
+        :param t: 暂停时间（秒），为 0 时不暂停
+        """
+        fig.canvas.draw_idle()
+        fig.canvas.flush_events()
+        if t > 0:
+            time.sleep(t)
+
+    def plot_path(self, path, cl='r', flag=False, animate=True):
         """
         绘制路径（逐段动画显示）
         :param path: 路径节点列表
         :param cl: 路径颜色（默认红色）
         :param flag: 是否使用自定义颜色（False=使用红色，True=使用cl参数指定的颜色）
+        :param animate: 是否逐段播放动画；False 时一次性绘制整条路径，不暂停
         """
         # 提取路径的 x 和 y 坐标
         path_x = [path[i][0] for i in range(len(path))]
@@ -217,8 +288,17 @@ class Plotting:
         # 选择颜色
         color = cl if flag else 'r'
 
+        if not animate:
+            # 整条路径用一条折线一次绘制
+            plt.plot(path_x, path_y, linewidth='3', color=color)
+            plt.plot(self.xI[0], self.xI[1], "bs")
+            plt.plot(self.xG[0], self.xG[1], "gs")
+            return
+
         # ========== 路径动画显示控制 ==========
         # 逐段绘制路径，让路径绘制过程可见
+        fig = plt.gcf()
+        plt.show(block=False)
         for i in range(len(path) - 1):
             # 绘制当前段（从第i个点到第i+1个点）
             plt.plot([path_x[i], path_x[i+1]], 
@@ -230,13 +310,13 @@ class Plotting:
             #   - 0.05秒: 适中速度（当前设置）
             #   - 0.1秒:  较慢，能清晰看到每一段
             #   - 0.2秒:  很慢，适合演示
-            plt.pause(0.05)
+            self._refresh(fig, 0.05)
 
         # 重新绘制起点和终点（确保它们在路径上方显示）
         plt.plot(self.xI[0], self.xI[1], "bs")
         plt.plot(self.xG[0], self.xG[1], "gs")
 
-        plt.pause(0.1)  # 路径绘制完成后的暂停时间
+        self._refresh(fig, 0.1)  # 路径绘制完成后的暂停时间
 
     def plot_visited_bi(self, v_fore, v_back):
         """
@@ -252,25 +332,27 @@ class Plotting:
         if self.xG in v_back:
             v_back.remove(self.xG)
 
-        len_fore, len_back = len(v_fore), len(v_back)
-
-        # 同时绘制前向和后向搜索的节点
-        for k in range(max(len_fore, len_back)):
-            # 绘制前向搜索节点（灰色）
-            if k < len_fore:
-                plt.plot(v_fore[k][0], v_fore[k][1], linewidth='3', color='gray', marker='o')
-            # 绘制后向搜索节点（蓝色）
-            if k < len_back:
-                plt.plot(v_back[k][0], v_back[k][1], linewidth='3', color='cornflowerblue', marker='o')
-
-            # 按 ESC 键退出程序
-            plt.gcf().canvas.mpl_connect('key_release_event',
-                                         lambda event: [exit(0) if event.key == 'escape' else None])
-
-            # 每 10 个节点刷新一次显示
-            if k % 10 == 0:
-                plt.pause(0.001)
-        plt.pause(0.01)
+        xy_fore = np.array(v_fore, dtype=float).reshape(-1, 2)
+        xy_back = np.array(v_back, dtype=float).reshape(-1, 2)
+
+        # 前向搜索节点（灰色）与后向搜索节点（蓝色）各用一个散点集合，
+        # 动画时只更新坐标（s = 默认 markersize 6 的平方）
+        ax = plt.gca()
+        sc_fore = ax.scatter([], [], color='gray', marker='o', s=36, zorder=2)
+        sc_back = ax.scatter([], [], color='cornflowerblue', marker='o', s=36, zorder=2)
+
+        fig = plt.gcf()
+        plt.show(block=False)
+
+        # 同时绘制前向和后向搜索的节点，每 10 个节点刷新一次显示
+        for k in range(0, max(len(xy_fore), len(xy_back)), 10):
+            sc_fore.set_offsets(xy_fore[:k + 1])
+            sc_back.set_offsets(xy_back[:k + 1])
+            self._refresh(fig, 0.001)
+
+        sc_fore.set_offsets(xy_fore)
+        sc_back.set_offsets(xy_back)
+        self._refresh(fig, 0.01)
 
     @staticmethod
     def color_list():